@@ -8,20 +8,26 @@
 # - "Run" button to enable the micro-ROS Agent
 # - Status endpoint to check if the micro-ROS Agent is currently running
 
+import functools
 import logging.handlers
+import os
+import queue
 import sys
 import asyncio
 
+import orjson
+
 from pathlib import Path
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
 from fastapi.requests import Request
 from fastapi import Query
 from typing import Dict, Any
 
 # Import the local modules
 from app import settings
+from app import static_files
 
 # Configure console logging
 console_handler = logging.StreamHandler(sys.stdout)
@@ -32,24 +38,47 @@ console_formatter = logging.Formatter(
 console_handler.setFormatter(console_formatter)
 
 # Create logger
+# Default to WARNING to keep per-request logging off the hot path;
+# override with e.g. LOG_LEVEL=DEBUG for development
 logger = logging.getLogger("micro_ros_agent")
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get("LOG_LEVEL", "WARNING").upper())
 logger.addHandler(console_handler)
 
-app = FastAPI()
+
+# Logger adapter that prepends a fixed prefix to each message, avoiding
+# per-call f-string concatenation in the agent start/stop functions
+class PrefixLoggerAdapter(logging.LoggerAdapter):
+    def process(self, msg, kwargs):
+        return "%s %s" % (self.extra["prefix"], msg), kwargs
+
+
+# Adapter for all messages from the agent start/stop functions
+agent_logger = PrefixLoggerAdapter(logger, {"prefix": "micro_ros_agent:"})
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+
+# Pre-built body fragments for the global exception handler, so error
+# responses need no dict construction or full serialization pass
+_ERR_PREFIX = (
+    b'{"success":false,"error":"Internal server error",'
+    b'"message":"Internal server error: '
+)
+_ERR_SUFFIX = b'"}'
 
 
 # Global exception handler to ensure all errors return JSON
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.exception(f"Unhandled exception in {request.url}: {str(exc)}")
-    return JSONResponse(
+
+    # orjson.dumps produces a quoted JSON string; strip the quotes and
+    # splice the escaped message into the template
+    message = orjson.dumps(str(exc))[1:-1]
+    return Response(
+        content=_ERR_PREFIX + message + _ERR_SUFFIX,
         status_code=500,
-        content={
-            "success": False,
-            "message": f"Internal server error: {str(exc)}",
-            "error": "Internal server error",
-        },
+        media_type="application/json",
     )
 
 
@@ -57,6 +86,23 @@ async def global_exception_handler(request: Request, exc: Exception):
 micro_ros_agent_running = False  # True if the micro-ROS Agent is currently running
 micro_ros_agent = None
 
+# Set by the internal start/stop tasks once the agent has reached a
+# terminal state, so the start/stop endpoints can return immediately
+# instead of sleeping for a fixed interval
+_state_changed = asyncio.Event()
+
+# Memoized response bodies for endpoints whose output only changes when
+# the settings are saved, keyed on the values in the body
+_settings_body_cache = {}
+
+# Pre-serialized bodies for the /status endpoint (polled by the frontend)
+_STATUS_RUNNING_BODY = orjson.dumps(
+    {"success": True, "running": True, "message": "Running"}
+)
+_STATUS_STOPPED_BODY = orjson.dumps(
+    {"success": True, "running": False, "message": "Stopped"}
+)
+
 # log that the backend has started
 logger.info("micro-ROS Agent backend started")
 
@@ -64,20 +110,16 @@ logger.info("micro-ROS Agent backend started")
 # Auto-start the micro-ROS Agent if it was previously enabled
 async def startup_auto_restart():
     """Check if the micro-ROS Agent was previously enabled and auto-restart if needed"""
-
-    # logging prefix for all messages from this function
-    logging_prefix_str = "micro_ros_agent:"
-
     try:
         enabled = settings.get_micro_ros_agent_enabled()
         if enabled:
-            logger.info(f"{logging_prefix_str} auto-restarting")
+            agent_logger.info("auto-restarting")
 
             # call startup function in a background thread
             asyncio.create_task(start_micro_ros_agent_internal())
 
     except Exception as e:
-        logger.error(f"{logging_prefix_str} error during auto-restart: {str(e)}")
+        agent_logger.error("error during auto-restart: %s", str(e))
 
 
 # Internal function to start the micro-ROS Agent
@@ -86,12 +128,10 @@ async def start_micro_ros_agent_internal():
     global micro_ros_agent_running
     global micro_ros_agent
 
-    # logging prefix for all messages from this function
-    logging_prefix_str = "micro_ros_agent:"
-
     try:
-        logger.info(f"{logging_prefix_str} starting...")
+        agent_logger.info("starting...")
         micro_ros_agent_running = True
+        _state_changed.set()
 
         # Get settings
         transport = settings.get_micro_ros_agent_transport()
@@ -112,17 +152,16 @@ async def start_micro_ros_agent_internal():
         # micro_ros_agent.start()
 
         # log settings used
-        logger.info(
-            f"{logging_prefix_str} "
-            f"transport: {transport}, "
-            f"port: {port}, "
-            f"verbose:{verbose}, "
+        agent_logger.info(
+            "transport: %s, port: %s, verbose: %s", transport, port, verbose
         )
 
     except Exception as e:
-        logger.error(f"{logging_prefix_str} error {str(e)}")
+        agent_logger.error("error %s", str(e))
+        micro_ros_agent_running = False
+        _state_changed.set()
     finally:
-        logger.info(f"{logging_prefix_str} stopped")
+        agent_logger.info("stopped")
 
 
 # Internal function to stop the micro-ROS Agent
@@ -131,27 +170,26 @@ async def stop_micro_ros_agent_internal():
     global micro_ros_agent_running
     global micro_ros_agent
 
-    # logging prefix for all messages from this function
-    logging_prefix_str = "micro_ros_agent:"
-
     try:
-        logger.info(f"{logging_prefix_str} stopping...")
+        agent_logger.info("stopping...")
         micro_ros_agent_running = False
+        _state_changed.set()
 
         if micro_ros_agent is not None:
             micro_ros_agent.stop()
 
     except Exception as e:
-        logger.error(f"{logging_prefix_str} error {str(e)}")
+        agent_logger.error("error %s", str(e))
+        _state_changed.set()
     finally:
-        logger.info(f"{logging_prefix_str} stopped")
+        agent_logger.info("stopped")
 
 # micro-ROS Agent API Endpoints
 
 
 # Load the micro-ROS Agent settings
 @app.post("/micro-ros-agent/get-settings")
-async def get_micro_ros_agent_settings() -> Dict[str, Any]:
+async def get_micro_ros_agent_settings() -> Response:
     """Get saved the micro-ROS Agent settings"""
     logger.debug("Getting the micro-ROS Agent settings")
 
@@ -161,17 +199,25 @@ async def get_micro_ros_agent_settings() -> Dict[str, Any]:
         port = settings.get_micro_ros_agent_port()
         verbose = settings.get_micro_ros_agent_verbose()
 
-        return {
-            "success": True,
-            "micro_ros_agent": {
-                "transport": transport,
-                "port": port,
-                "verbose": verbose,
-            },
-        }
+        key = ("settings", transport, port, verbose)
+        body = _settings_body_cache.get(key)
+        if body is None:
+            body = orjson.dumps(
+                {
+                    "success": True,
+                    "micro_ros_agent": {
+                        "transport": transport,
+                        "port": port,
+                        "verbose": verbose,
+                    },
+                }
+            )
+            _settings_body_cache[key] = body
+
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         logger.exception(f"Error getting the micro-ROS Agent settings: {str(e)}")
-        return {"success": False, "message": f"Error: {str(e)}"}
+        return ORJSONResponse({"success": False, "message": f"Error: {str(e)}"})
 
 
 # Save the micro-ROS Agent settings
@@ -180,7 +226,7 @@ async def save_micro_ros_agent_settings(
     transport: str = Query(...),
     port: int = Query(...),
     verbose: str = Query(...),
-) -> Dict[str, Any]:
+) -> Response:
     """Save the micro-ROS Agent settings to persistent storage (using query parameters)"""
     logger.info(
         f"Saving the micro-ROS Agent settings: "
@@ -189,63 +235,79 @@ async def save_micro_ros_agent_settings(
         f"verbose={verbose}, "
     )
 
-    # Save settings
-    transport_success = settings.update_micro_ros_agent_transport(transport)
-    port_success = settings.update_micro_ros_agent_port(port)
-    verbose_success = settings.update_micro_ros_agent_verbose(verbose)
-
-    if (
-        transport_success
-        and port_success
-        and verbose_success
-    ):
-        return {"success": True, "message": f"Settings saved"}
+    # Save all settings with a single file write, run in a worker thread
+    # to keep the event loop free
+    loop = asyncio.get_running_loop()
+    success = await loop.run_in_executor(
+        None,
+        functools.partial(
+            settings.update_micro_ros_agent_settings,
+            transport=transport,
+            port=port,
+            verbose=verbose,
+        ),
+    )
+
+    if success:
+        _settings_body_cache.clear()
+        return ORJSONResponse({"success": True, "message": "Settings saved"})
     else:
-        return {"success": False, "message": "Failed to save some settings"}
+        return ORJSONResponse({"success": False, "message": "Failed to save some settings"})
 
 
 # Get the micro-ROS Agent enabled state
 @app.get("/micro-ros-agent/get-enabled-state")
-async def get_micro_ros_agent_enabled_state() -> Dict[str, Any]:
+async def get_micro_ros_agent_enabled_state() -> Response:
     """Get saved the micro-ROS Agent enabled state (supports both GET and POST)"""
     logger.debug("Getting the micro-ROS Agent enabled state")
 
     try:
         enabled = settings.get_micro_ros_agent_enabled()
-        return {"success": True, "enabled": enabled}
+
+        key = ("enabled", enabled)
+        body = _settings_body_cache.get(key)
+        if body is None:
+            body = orjson.dumps({"success": True, "enabled": enabled})
+            _settings_body_cache[key] = body
+
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         logger.exception(f"Error getting the micro-ROS Agent enabled state: {str(e)}")
-        return {"success": False, "message": f"Error: {str(e)}", "enabled": False}
+        return Response(
+            content=orjson.dumps(
+                {"success": False, "message": f"Error: {str(e)}", "enabled": False}
+            ),
+            media_type="application/json",
+        )
 
 
 # Save the micro-ROS Agent enabled state
 @app.post("/micro-ros-agent/save-enabled-state")
-async def save_micro_ros_agent_enabled_state(enabled: bool = Query(...)) -> Dict[str, Any]:
+async def save_micro_ros_agent_enabled_state(enabled: bool = Query(...)) -> Response:
     """Save the micro-ROS Agent enabled state to persistent storage (using query parameter)"""
     logger.info(f"micro-ROS Agent enabled state: {enabled}")
-    success = settings.update_micro_ros_agent_enabled(enabled)
+
+    # Save in a worker thread to keep the event loop free
+    loop = asyncio.get_running_loop()
+    success = await loop.run_in_executor(
+        None, settings.update_micro_ros_agent_enabled, enabled
+    )
 
     if success:
-        return {"success": True, "message": f"Enabled state saved: {enabled}"}
+        _settings_body_cache.clear()
+        return ORJSONResponse({"success": True, "message": f"Enabled state saved: {enabled}"})
     else:
-        return {"success": False, "message": "Failed to save enabled state"}
+        return ORJSONResponse({"success": False, "message": "Failed to save enabled state"})
 
 
 # Get the micro-ROS Agent status
 @app.get("/micro-ros-agent/status")
-async def get_micro_ros_agent_status() -> Dict[str, Any]:
+async def get_micro_ros_agent_status() -> Response:
     """Get the micro-ROS Agent status"""
-    logger.debug("Getting the micro-ROS Agent status")
-
-    try:
-        return {
-            "success": True,
-            "running": micro_ros_agent_running,
-            "message": "Running" if micro_ros_agent_running else "Stopped",
-        }
-    except Exception as e:
-        logger.exception(f"Error getting the micro-ROS Agent status: {str(e)}")
-        return {"success": False, "message": f"Error: {str(e)}", "running": False}
+    return Response(
+        content=_STATUS_RUNNING_BODY if micro_ros_agent_running else _STATUS_STOPPED_BODY,
+        media_type="application/json",
+    )
 
 
 # Start the micro-ROS Agent (this is called by the frontend's "Run" button)
@@ -259,10 +321,14 @@ async def start_micro_ros_agent() -> Dict[str, Any]:
             return {"success": False, "message": "the micro-ROS Agent is already running"}
 
         # Start the micro-ROS Agent
+        _state_changed.clear()
         asyncio.create_task(start_micro_ros_agent_internal())
 
-        # Wait a few seconds to catch immediate failures
-        await asyncio.sleep(2)
+        # Wait (up to a few seconds) for the agent to report its state
+        try:
+            await asyncio.wait_for(_state_changed.wait(), timeout=2.0)
+        except asyncio.TimeoutError:
+            pass
 
         # Check if it's actually running now
         if micro_ros_agent_running:
@@ -292,10 +358,14 @@ async def stop_micro_ros_agent() -> Dict[str, Any]:
     try:
 
         # Stop the micro-ROS Agent
+        _state_changed.clear()
         asyncio.create_task(stop_micro_ros_agent_internal())
 
-        # Wait a few seconds to catch immediate failures
-        await asyncio.sleep(2)
+        # Wait (up to a few seconds) for the agent to report its state
+        try:
+            await asyncio.wait_for(_state_changed.wait(), timeout=2.0)
+        except asyncio.TimeoutError:
+            pass
 
         # Check if it's stopped
         if not micro_ros_agent_running:
@@ -323,18 +393,33 @@ async def on_startup():
 
 # Mount static files AFTER defining API routes
 # Use absolute path to handle Docker container environment
+# Assets are served from an in-memory cache with ETag and gzip support
 static_dir = Path(__file__).parent / "static"
-app.mount("/", StaticFiles(directory=static_dir, html=True), name="static")
+app.mount(
+    "/", static_files.CachedStaticFiles(directory=static_dir, html=True), name="static"
+)
 
 # Set up logging for the app
+# File writes go through a queue so disk I/O happens on a background
+# thread instead of inside the asyncio loop
 log_dir = Path("./logs")  # Use local logs directory instead of /app/logs
 log_dir.mkdir(parents=True, exist_ok=True)
 fh = logging.handlers.RotatingFileHandler(
     log_dir / "lumber.log", maxBytes=2**16, backupCount=1
 )
-logger.addHandler(fh)
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, fh)
+log_listener.start()
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=9133)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=9133,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
@@ -2,7 +2,7 @@
 
 # Manage micro-ROS Agent settings
 
-import json
+import msgspec
 import os
 import logging
 from pathlib import Path
@@ -12,50 +12,81 @@ logger = logging.getLogger("micro_ros_agent.settings")
 # Settings file path - stored in the extension's persistent storage directory
 SETTINGS_FILE = Path("/app/settings/micro-ros-agent-settings.json")
 
+
 # Default micro-ROS agent settings
 # enabled:              false
 # transport:            udp4
 # port:                 2019
 # verbose:              4
 
-DEFAULT_SETTINGS = {
-    "micro_ros_agent": {
-        "enabled": False,
-        "transport": "udp4",
-        "port": "2019",
-        "verbose": "4",
-    },
-}
+class AgentSettings(msgspec.Struct):
+    """micro-ROS agent settings with typed C-level attribute access"""
+
+    enabled: bool = False
+    transport: str = "udp4"
+    port: int = 2019
+    verbose: int = 4
+
+
+class Settings(msgspec.Struct):
+    """Top-level settings schema matching the on-disk file layout"""
+
+    micro_ros_agent: AgentSettings = msgspec.field(default_factory=AgentSettings)
+
 
+# In-memory cache of the parsed settings, invalidated when the file's
+# mtime changes (e.g. the file is edited outside the extension)
+_cache = None
+_cache_mtime = None
 
-# get the dictionary of settings from the settings file
+# True once the settings directory is known to exist, so saves can skip
+# the makedirs syscall after the first write
+_dir_ready = False
+
+
+# get the settings from the settings file
 def get_settings():
     """
     Load settings from the settings file.
     Creates default settings file if it doesn't exist.
+    Uses a cached copy unless the file has changed on disk.
 
     Returns:
-        dict: The settings dictionary
+        Settings: The settings
     """
+    global _cache, _cache_mtime
+
     try:
         if not SETTINGS_FILE.exists():
             logger.info(f"Settings file not found, creating default at {SETTINGS_FILE}")
-            save_settings(DEFAULT_SETTINGS)
-            return DEFAULT_SETTINGS
+            settings = Settings()
+            save_settings(settings)
+            return settings
 
-        with open(SETTINGS_FILE, "r") as f:
-            settings = json.load(f)
+        mtime = SETTINGS_FILE.stat().st_mtime_ns
+        if _cache is not None and _cache_mtime == mtime:
+            return _cache
 
-            return settings
+        # Decode straight into the typed struct; strict=False coerces
+        # string port/verbose values from older files to int
+        settings = msgspec.json.decode(
+            SETTINGS_FILE.read_bytes(), type=Settings, strict=False
+        )
+
+        _cache = settings
+        _cache_mtime = mtime
+
+        return settings
     except Exception as e:
         logger.error(f"Error loading settings, using defaults: {e}")
         # Try to save default settings for next time
+        settings = Settings()
         try:
-            save_settings(DEFAULT_SETTINGS)
+            save_settings(settings)
         except Exception:
             logger.exception("Failed to save default settings")
 
-        return DEFAULT_SETTINGS
+        return settings
 
 
 # save settings to the settings file
@@ -64,14 +95,25 @@ def save_settings(settings):
     Save settings to the settings file
 
     Args:
-        settings (dict): Settings dictionary to save
+        settings (Settings): Settings to save
     """
-    try:
-        # Ensure parent directory exists
-        os.makedirs(SETTINGS_FILE.parent, exist_ok=True)
+    global _cache, _cache_mtime, _dir_ready
 
-        with open(SETTINGS_FILE, "w") as f:
-            json.dump(settings, f, indent=2)
+    try:
+        # Ensure parent directory exists (first write only)
+        if not _dir_ready:
+            SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _dir_ready = True
+
+        # Write to a temporary file and rename so the settings file is
+        # always complete, even if the write is interrupted
+        tmp_file = SETTINGS_FILE.with_suffix(".json.tmp")
+        tmp_file.write_bytes(msgspec.json.format(msgspec.json.encode(settings), indent=2))
+        os.replace(tmp_file, SETTINGS_FILE)
+
+        # Keep the cache in sync with what was just written
+        _cache = settings
+        _cache_mtime = SETTINGS_FILE.stat().st_mtime_ns
     except Exception as e:
         logger.error(f"Error saving settings: {e}")
 
@@ -85,14 +127,7 @@ def get_micro_ros_agent_enabled():
         bool: True if the micro-ROS agent is enabled, False otherwise
     """
     try:
-        settings = get_settings()
-
-        # Check if the micro-ROS agent section exists
-        if "micro_ros_agent" in settings and "enabled" in settings["micro_ros_agent"]:
-            return settings["micro_ros_agent"]["enabled"]
-
-        # Return default if not found
-        return DEFAULT_SETTINGS["micro_ros_agent"]["enabled"]
+        return get_settings().micro_ros_agent.enabled
     except Exception as e:
         logger.error(f"Error getting the micro-ROS agent enabled state: {e}")
         return False
@@ -111,17 +146,38 @@ def update_micro_ros_agent_enabled(enabled):
     """
     try:
         settings = get_settings()
+        settings.micro_ros_agent.enabled = enabled
 
-        # Ensure the micro-ROS agent section exists
-        if "micro_ros_agent" not in settings:
-            settings["micro_ros_agent"] = {}
+        save_settings(settings)
+        return True
+    except Exception as e:
+        logger.error(f"Error updating the micro-ROS agent enabled state: {e}")
+        return False
+
+
+# update several micro-ROS agent settings with a single read and write
+def update_micro_ros_agent_settings(**fields):
+    """
+    Update one or more micro-ROS agent settings in a single file write
 
-        settings["micro_ros_agent"]["enabled"] = enabled
+    Args:
+        **fields: Settings to update (e.g. transport, port, verbose)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        settings = get_settings()
+        for key, value in fields.items():
+            # port and verbose are stored as int
+            if key in ("port", "verbose") and not isinstance(value, int):
+                value = int(value)
+            setattr(settings.micro_ros_agent, key, value)
 
         save_settings(settings)
         return True
     except Exception as e:
-        logger.error(f"Error updating the micro-ROS agent enabled state: {e}")
+        logger.error(f"Error updating the micro-ROS agent settings: {e}")
         return False
 
 
@@ -133,10 +189,7 @@ def get_micro_ros_agent_transport():
     Returns:
         str: The transport (default: udp4)
     """
-    settings = get_settings()
-    return settings.get("micro_ros_agent", {}).get(
-        "transport", DEFAULT_SETTINGS["micro_ros_agent"]["transport"]
-    )
+    return get_settings().micro_ros_agent.transport
 
 
 # update the micro-ROS agent transport
@@ -152,12 +205,7 @@ def update_micro_ros_agent_transport(transport):
     """
     try:
         settings = get_settings()
-
-        # Ensure the micro-ROS agent section exists
-        if "micro_ros_agent" not in settings:
-            settings["micro_ros_agent"] = {}
-
-        settings["micro_ros_agent"]["transport"] = transport
+        settings.micro_ros_agent.transport = transport
 
         save_settings(settings)
         return True
@@ -174,10 +222,7 @@ def get_micro_ros_agent_port():
     Returns:
         int: The port (default: 2019)
     """
-    settings = get_settings()
-    return settings.get("micro_ros_agent", {}).get(
-        "port", DEFAULT_SETTINGS["micro_ros_agent"]["port"]
-    )
+    return get_settings().micro_ros_agent.port
 
 
 # update the micro-ROS agent port
@@ -193,12 +238,7 @@ def update_micro_ros_agent_port(port):
     """
     try:
         settings = get_settings()
-
-        # Ensure the micro-ROS agent section exists
-        if "micro_ros_agent" not in settings:
-            settings["micro_ros_agent"] = {}
-
-        settings["micro_ros_agent"]["port"] = port
+        settings.micro_ros_agent.port = int(port)
 
         save_settings(settings)
         return True
@@ -215,10 +255,7 @@ def get_micro_ros_agent_verbose():
     Returns:
         int: The verbose level (default: 4)
     """
-    settings = get_settings()
-    return settings.get("micro_ros_agent", {}).get(
-        "verbose", DEFAULT_SETTINGS["micro_ros_agent"]["verbose"]
-    )
+    return get_settings().micro_ros_agent.verbose
 
 
 # update the micro-ROS agent verbose level
@@ -234,12 +271,7 @@ def update_micro_ros_agent_verbose(verbose):
     """
     try:
         settings = get_settings()
-
-        # Ensure the micro-ROS agent section exists
-        if "micro_ros_agent" not in settings:
-            settings["micro_ros_agent"] = {}
-
-        settings["micro_ros_agent"]["verbose"] = verbose
+        settings.micro_ros_agent.verbose = int(verbose)
 
         save_settings(settings)
         return True
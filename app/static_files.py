@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# Serve the frontend static assets from an in-memory cache
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+
+from pathlib import Path
+from fastapi import Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+
+logger = logging.getLogger("micro_ros_agent.static_files")
+
+# File types worth pre-compressing (images are already compressed)
+COMPRESSIBLE_SUFFIXES = {".html", ".htm", ".css", ".js", ".json", ".svg", ".txt"}
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles variant that preloads all assets into memory at startup.
+
+    The assets are baked into the Docker image and never change at
+    runtime, so each file is read once, hashed for an ETag and
+    pre-gzipped. Requests are then served from memory, and repeated
+    requests from the frontend poll loop get a 304 Not Modified.
+    """
+
+    def __init__(self, *, directory, html=False):
+        super().__init__(directory=directory, html=html)
+        self._cache = {}
+        self._load_cache(Path(directory))
+
+    def _load_cache(self, directory):
+        """Read, hash and pre-compress every file under the static directory"""
+        for path in directory.rglob("*"):
+            if not path.is_file():
+                continue
+
+            data = path.read_bytes()
+            etag = f'"{hashlib.md5(data).hexdigest()}"'
+            media_type = (
+                mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            )
+
+            # Only keep the gzipped copy if it is actually smaller
+            gzipped = None
+            if path.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+                compressed = gzip.compress(data)
+                if len(compressed) < len(data):
+                    gzipped = compressed
+
+            rel_path = path.relative_to(directory).as_posix()
+            self._cache[rel_path] = (data, gzipped, etag, media_type)
+
+        logger.info(f"Cached {len(self._cache)} static files from {directory}")
+
+    async def get_response(self, path, scope):
+        """Serve a cached asset, falling back to StaticFiles for misses"""
+        entry = self._cache.get(path)
+
+        # Serve index.html for the root path when html mode is enabled
+        if entry is None and self.html and path in ("", "."):
+            entry = self._cache.get("index.html")
+
+        if entry is None:
+            return await super().get_response(path, scope)
+
+        data, gzipped, etag, media_type = entry
+        request_headers = Headers(scope=scope)
+
+        if request_headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"etag": etag})
+
+        headers = {"etag": etag, "vary": "accept-encoding"}
+        if gzipped is not None and "gzip" in request_headers.get(
+            "accept-encoding", ""
+        ):
+            headers["content-encoding"] = "gzip"
+            return Response(gzipped, media_type=media_type, headers=headers)
+
+        return Response(data, media_type=media_type, headers=headers)